@@ -267,11 +267,24 @@ class EvAdventureTurnbasedCombatHandler(EvAdventureCombatBaseHandler):
             action_dict (dict): A dict describing the action class by name along with properties.
 
         """
-        self.combatants[combatant] = action_dict
+        self.queue_actions({combatant: action_dict})
+
+    def queue_actions(self, action_dicts):
+        """
+        Queue actions for several combatants at once. All actions are stored before checking
+        if everyone has acted, so they all end up in the same turn.
+
+        Args:
+            action_dicts (dict): A mapping `{combatant: action_dict, ...}`, where each
+                `action_dict` describes the action class by name along with properties.
+
+        """
+        self.combatants.update(action_dicts)
 
         # track who inserted actions this turn (non-persistent)
         did_action = set(self.ndb.did_action or set())
-        did_action.add(combatant)
+        did_action.update(action_dicts)
+        self.ndb.did_action = did_action
         if len(did_action) >= len(self.combatants):
             # everyone has inserted an action. Start next turn without waiting!
             self.force_repeat()
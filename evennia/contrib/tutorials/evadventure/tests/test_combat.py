@@ -3,8 +3,11 @@ Test EvAdventure combat.
 
 """
 
+from unittest import TestCase
 from unittest.mock import Mock, call, patch
 
+from parameterized import parameterized
+
 from evennia.utils import create
 from evennia.utils.ansi import strip_ansi
 from evennia.utils.test_resources import BaseEvenniaTest, EvenniaCommandTestMixin, EvenniaTestCase
@@ -16,8 +19,58 @@ from ..npcs import EvAdventureMob
 from ..objects import EvAdventureConsumable, EvAdventureRunestone, EvAdventureWeapon
 from ..rooms import EvAdventureRoom
 
+# the actions expected to be available in turn-based combat
+_TURNBASED_ACTION_CLASSES = {
+    "hold": combat_turnbased.CombatActionHold,
+    "attack": combat_turnbased.CombatActionAttack,
+    "stunt": combat_turnbased.CombatActionStunt,
+    "use": combat_turnbased.CombatActionUseItem,
+    "wield": combat_turnbased.CombatActionWield,
+    "flee": combat_turnbased.CombatActionFlee,
+}
+
+# action-dicts; only used read-only, so they can be shared between tests
+_HOLD = {"key": "hold"}
+
+
+def _attack(target):
+    return {"key": "attack", "target": target}
+
+
+def _stunt(recipient, target, advantage):
+    return {
+        "key": "stunt",
+        "recipient": recipient,
+        "target": target,
+        "advantage": advantage,
+        "stunt_type": Ability.STR,
+        "defense_type": Ability.DEX,
+    }
+
+
+# stunt outcomes to test, as (roll, advantage?, stunt succeeds?)
+_STUNT_ROLLS = [
+    (8, True, False),  # fails 8+1 dex vs DEX 11 defence
+    (11, True, True),  # 11+1 dex vs DEX 11 defence is success
+    (11, False, True),
+]
+
+
+class _MockRandintMixin:
+    """
+    Mock the dice-roller's `randint` as `mock_randint`, so tests can set its `return_value`
+    to decide the outcome of rolls.
+
+    """
+
+    def setUp(self):
+        super().setUp()
+        randint_patcher = patch("evennia.contrib.tutorials.evadventure.combat_base.rules.randint")
+        self.mock_randint = randint_patcher.start()
+        self.addCleanup(randint_patcher.stop)
+
 
-class _CombatTestBase(EvenniaTestCase):
+class _CombatTestBase(_MockRandintMixin, EvenniaTestCase):
     """
     Set up common entities for testing combat:
 
@@ -30,25 +83,54 @@ class _CombatTestBase(EvenniaTestCase):
 
     """
 
-    def setUp(self):
-        self.location = create.create_object(EvAdventureRoom, key="testroom")
-        self.combatant = create.create_object(
-            EvAdventureCharacter, key="testchar", location=self.location
-        )
-
-        self.location.allow_combat = True
-        self.location.allow_death = True
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Create the entities once for the whole class; each test runs in a transaction that is
+        rolled back afterwards. We only store the ids, since typeclassed entities can't be
+        deep-copied for per-test isolation.
 
-        self.target = create.create_object(
+        """
+        location = create.create_object(
+            EvAdventureRoom,
+            key="testroom",
+            attributes=(("allow_combat", True), ("allow_death", True)),
+        )
+        combatant = create.create_object(EvAdventureCharacter, key="testchar", location=location)
+        target = create.create_object(
             EvAdventureMob,
             key="testmonster",
-            location=self.location,
+            location=location,
             attributes=(("is_idle", True),),
         )
+        cls.location_id, cls.combatant_id, cls.target_id = location.id, combatant.id, target.id
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # one msg-mock per combatant for the whole class; these are reset before every test
+        cls._combatant_msg_mock = Mock()
+        cls._target_msg_mock = Mock()
+
+    def setUp(self):
+        super().setUp()
+        # re-fetch so every test gets fresh instances (the id-cache is flushed in tearDown)
+        self.location = EvAdventureRoom.objects.get(id=self.location_id)
+        self.combatant = EvAdventureCharacter.objects.get(id=self.combatant_id)
+        self.target = EvAdventureMob.objects.get(id=self.target_id)
 
         # mock the msg so we can check what they were sent later
-        self.combatant.msg = Mock()
-        self.target.msg = Mock()
+        self._combatant_msg_mock.reset_mock()
+        self._target_msg_mock.reset_mock()
+        self.combatant.msg = self._combatant_msg_mock
+        self.target.msg = self._target_msg_mock
+
+    def tearDown(self):
+        # entities with ndb-data (like a cached combathandler) are never flushed from the id-cache,
+        # which would leak their state into the next test
+        for obj in (self.location, self.combatant, self.target):
+            obj.nattributes.clear()
+        super().tearDown()
 
 
 class TestEvAdventureCombatBaseHandler(_CombatTestBase):
@@ -63,19 +145,22 @@ class TestEvAdventureCombatBaseHandler(_CombatTestBase):
         self.combathandler = combat_base.EvAdventureCombatBaseHandler.get_or_create_combathandler(
             self.location, key="combathandler"
         )
+        # mock the msg_contents so we can check what the handler broadcast
+        self.location.msg_contents = Mock()
 
     def test_combathandler_msg(self):
         """Test sending messages to all in handler"""
 
-        self.location.msg_contents = Mock()
-
         self.combathandler.msg("test_message")
 
-        self.location.msg_contents.assert_called_with(
-            "test_message",
-            exclude=[],
-            from_obj=None,
-            mapping={"testchar": self.combatant, "testmonster": self.target},
+        self.assertEqual(
+            self.location.msg_contents.call_args,
+            call(
+                "test_message",
+                exclude=[],
+                from_obj=None,
+                mapping={"testchar": self.combatant, "testmonster": self.target},
+            ),
         )
 
     def test_get_combat_summary(self):
@@ -101,9 +186,50 @@ class TestEvAdventureCombatBaseHandler(_CombatTestBase):
         )
 
 
+class TestCombatActionsLogic(_MockRandintMixin, TestCase):
+    """
+    Test the subclasses of CombatAction in combat_base.py that only need the protocol of the
+    combathandler and combatants, using in-memory stand-ins instead of database entities.
+
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.combathandler = Mock(spec=combat_base.EvAdventureCombatBaseHandler)
+        self.combatant = Mock(spec=EvAdventureCharacter, key="testchar", strength=1, dexterity=1)
+        self.target = Mock(spec=EvAdventureMob, key="testmonster", strength=1, dexterity=1)
+
+    def test_base_action(self):
+        action = combat_base.CombatAction(
+            self.combathandler, self.combatant, {"key": "hold", "foo": "bar"}
+        )
+        self.assertEqual(action.key, "hold")
+        self.assertEqual(action.foo, "bar")
+        self.assertEqual(action.combathandler, self.combathandler)
+        self.assertEqual(action.combatant, self.combatant)
+
+    @parameterized.expand(_STUNT_ROLLS)
+    def test_stunt(self, roll, advantage, is_success):
+        if advantage:
+            recipient, target = self.combatant, self.target
+            give_method = self.combathandler.give_advantage
+        else:
+            recipient, target = self.target, self.combatant
+            give_method = self.combathandler.give_disadvantage
+        action_dict = _stunt(recipient, target, advantage)
+        self.mock_randint.return_value = roll
+        action = combat_base.CombatActionStunt(self.combathandler, self.combatant, action_dict)
+        action.execute()
+        if is_success:
+            give_method.assert_called_with(recipient, target)
+        else:
+            give_method.assert_not_called()
+
+
 class TestCombatActionsBase(_CombatTestBase):
     """
-    A class for testing all subclasses of CombatAction in combat_base.py
+    A class for testing the subclasses of CombatAction in combat_base.py that need the
+    combatants' database state (health, equipment and items).
 
     """
 
@@ -124,78 +250,21 @@ class TestCombatActionsBase(_CombatTestBase):
         self.combathandler.has_disadvantage = Mock()
         self.combathandler.queue_action = Mock()
 
-    def test_base_action(self):
-        action = combat_base.CombatAction(
-            self.combathandler, self.combatant, {"key": "hold", "foo": "bar"}
-        )
-        self.assertEqual(action.key, "hold")
-        self.assertEqual(action.foo, "bar")
-        self.assertEqual(action.combathandler, self.combathandler)
-        self.assertEqual(action.combatant, self.combatant)
-
-    @patch("evennia.contrib.tutorials.evadventure.combat_base.rules.randint")
-    def test_attack__miss(self, mock_randint):
-        actiondict = {"key": "attack", "target": self.target}
-
-        mock_randint.return_value = 8  # target has default armor 11, so 8+1 str will miss
-        action = combat_base.CombatActionAttack(self.combathandler, self.combatant, actiondict)
-        action.execute()
-        self.assertEqual(self.target.hp, 4)
-
-    @patch("evennia.contrib.tutorials.evadventure.combat_base.rules.randint")
-    def test_attack__success(self, mock_randint):
-        actiondict = {"key": "attack", "target": self.target}
+    @parameterized.expand(
+        [
+            # roll, initial hp, expected hp
+            (8, 4, 4),  # target has default armor 11, so 8+1 str will miss
+            (11, 20, 9),  # 11 + 1 str will hit beat armor 11
+        ]
+    )
+    def test_attack(self, roll, initial_hp, expected_hp):
+        actiondict = _attack(self.target)
 
-        mock_randint.return_value = 11  # 11 + 1 str will hit beat armor 11
-        self.target.hp = 20
+        self.mock_randint.return_value = roll
+        self.target.hp = initial_hp
         action = combat_base.CombatActionAttack(self.combathandler, self.combatant, actiondict)
         action.execute()
-        self.assertEqual(self.target.hp, 9)
-
-    @patch("evennia.contrib.tutorials.evadventure.combat_base.rules.randint")
-    def test_stunt_fail(self, mock_randint):
-        action_dict = {
-            "key": "stunt",
-            "recipient": self.combatant,
-            "target": self.target,
-            "advantage": True,
-            "stunt_type": Ability.STR,
-            "defense_type": Ability.DEX,
-        }
-        mock_randint.return_value = 8  # fails 8+1 dex vs DEX 11 defence
-        action = combat_base.CombatActionStunt(self.combathandler, self.combatant, action_dict)
-        action.execute()
-        self.combathandler.give_advantage.assert_not_called()
-
-    @patch("evennia.contrib.tutorials.evadventure.combat_base.rules.randint")
-    def test_stunt_advantage__success(self, mock_randint):
-        action_dict = {
-            "key": "stunt",
-            "recipient": self.combatant,
-            "target": self.target,
-            "advantage": True,
-            "stunt_type": Ability.STR,
-            "defense_type": Ability.DEX,
-        }
-        mock_randint.return_value = 11  # 11+1 dex vs DEX 11 defence is success
-        action = combat_base.CombatActionStunt(self.combathandler, self.combatant, action_dict)
-        action.execute()
-        self.combathandler.give_advantage.assert_called_with(self.combatant, self.target)
-
-    @patch("evennia.contrib.tutorials.evadventure.combat_base.rules.randint")
-    def test_stunt_disadvantage__success(self, mock_randint):
-        action_dict = {
-            "key": "stunt",
-            "recipient": self.target,
-            "target": self.combatant,
-            "advantage": False,
-            "stunt_type": Ability.STR,
-            "defense_type": Ability.DEX,
-        }
-        mock_randint.return_value = 11  # 11+1 dex vs DEX 11 defence is success
-        action = combat_base.CombatActionStunt(self.combathandler, self.combatant, action_dict)
-        action.execute()
-        self.combathandler.give_disadvantage.assert_called_with(self.target, self.combatant)
+        self.assertEqual(self.target.hp, expected_hp)
 
     def test_use_item(self):
         """
@@ -290,14 +359,20 @@ class EvAdventureTurnbasedCombatHandlerTest(_CombatTestBase):
 
     maxDiff = None
 
-    # make sure to mock away all time-keeping elements
-    @patch(
-        (
-            "evennia.contrib.tutorials.evadventure."
-            "combat_turnbased.EvAdventureTurnbasedCombatHandler.interval"
-        ),
-        new=-1,
-    )
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # make sure to mock away all time-keeping elements
+        interval_patcher = patch(
+            (
+                "evennia.contrib.tutorials.evadventure."
+                "combat_turnbased.EvAdventureTurnbasedCombatHandler.interval"
+            ),
+            new=-1,
+        )
+        interval_patcher.start()
+        cls.addClassCleanup(interval_patcher.stop)
+
     def setUp(self):
         super().setUp()
         # add target to combat
@@ -309,18 +384,15 @@ class EvAdventureTurnbasedCombatHandlerTest(_CombatTestBase):
         self.combathandler.add_combatant(self.combatant)
         self.combathandler.add_combatant(self.target)
 
-    def _get_action(self, action_dict={"key": "hold"}):
+    def _get_action(self, action_dict=_HOLD):
         action_class = self.combathandler.action_classes[action_dict["key"]]
         return action_class(self.combathandler, self.combatant, action_dict)
 
-    def _run_actions(
-        self, action_dict, action_dict2={"key": "hold"}, combatant_msg=None, target_msg=None
-    ):
+    def _run_actions(self, action_dict, action_dict2=_HOLD, combatant_msg=None, target_msg=None):
         """
         Helper method to run an action and check so combatant saw the expected message.
         """
-        self.combathandler.queue_action(self.combatant, action_dict)
-        self.combathandler.queue_action(self.target, action_dict2)
+        self.combathandler.queue_actions({self.combatant: action_dict, self.target: action_dict2})
         self.combathandler.at_repeat()
         if combatant_msg is not None:
             # this works because we mock combatant.msg in SetUp
@@ -334,31 +406,21 @@ class EvAdventureTurnbasedCombatHandlerTest(_CombatTestBase):
 
         chandler = self.combathandler
         self.assertEqual(
-            dict(chandler.combatants),
-            {self.combatant: {"key": "hold"}, self.target: {"key": "hold"}},
-        )
-        self.assertEqual(
-            dict(chandler.action_classes),
-            {
-                "hold": combat_turnbased.CombatActionHold,
-                "attack": combat_turnbased.CombatActionAttack,
-                "stunt": combat_turnbased.CombatActionStunt,
-                "use": combat_turnbased.CombatActionUseItem,
-                "wield": combat_turnbased.CombatActionWield,
-                "flee": combat_turnbased.CombatActionFlee,
-            },
+            chandler.combatants,
+            {self.combatant: _HOLD, self.target: _HOLD},
         )
+        self.assertEqual(chandler.action_classes, _TURNBASED_ACTION_CLASSES)
         self.assertEqual(chandler.flee_timeout, 1)
-        self.assertEqual(dict(chandler.advantage_matrix), {})
-        self.assertEqual(dict(chandler.disadvantage_matrix), {})
-        self.assertEqual(dict(chandler.fleeing_combatants), {})
-        self.assertEqual(dict(chandler.defeated_combatants), {})
+        self.assertEqual(chandler.advantage_matrix, {})
+        self.assertEqual(chandler.disadvantage_matrix, {})
+        self.assertEqual(chandler.fleeing_combatants, {})
+        self.assertEqual(chandler.defeated_combatants, [])
 
     def test_remove_combatant(self):
         """Remove a combatant."""
 
         self.combathandler.remove_combatant(self.target)
-        self.assertEqual(dict(self.combathandler.combatants), {self.combatant: {"key": "hold"}})
+        self.assertEqual(self.combathandler.combatants, {self.combatant: _HOLD})
 
     def test_stop_combat(self):
         """Stopping combat, making sure combathandler is deleted."""
@@ -392,31 +454,71 @@ class EvAdventureTurnbasedCombatHandlerTest(_CombatTestBase):
     def test_queue_and_execute_action(self):
         """Queue actions and execute"""
 
-        hold = {"key": "hold"}
-
-        self.combathandler.queue_action(self.combatant, hold)
+        self.combathandler.queue_action(self.combatant, _HOLD)
         self.assertEqual(
-            dict(self.combathandler.combatants),
-            {self.combatant: {"key": "hold"}, self.target: {"key": "hold"}},
+            self.combathandler.combatants,
+            {self.combatant: _HOLD, self.target: _HOLD},
         )
 
         mock_action = Mock()
-        self.combathandler.action_classes["hold"] = Mock(return_value=mock_action)
+        mock_action_class = Mock(return_value=mock_action)
+        # action_classes is shared by the class, so don't leave the mock in it for other tests
+        with patch.dict(self.combathandler.action_classes, {"hold": mock_action_class}):
+            self.combathandler.execute_next_action(self.combatant)
+
+        mock_action_class.assert_called_with(self.combathandler, self.combatant, _HOLD)
+        mock_action.execute.assert_called_once()
+
+    def test_queue_action__not_everyone_queued(self):
+        """Queueing for only some combatants should not end the turn early"""
+
+        self.combathandler.force_repeat = Mock()
+
+        self.combathandler.queue_action(self.combatant, _HOLD)
 
-        self.combathandler.execute_next_action(self.combatant)
+        self.assertEqual(self.combathandler.ndb.did_action, {self.combatant})
+        self.combathandler.force_repeat.assert_not_called()
 
-        self.combathandler.action_classes["hold"].assert_called_with(
-            self.combathandler, self.combatant, hold
+    def test_queue_actions__everyone_queued(self):
+        """Once everyone has queued an action, the next turn starts without waiting"""
+
+        self.combathandler.force_repeat = Mock()
+
+        self.combathandler.queue_actions({self.combatant: _HOLD, self.target: _HOLD})
+
+        self.assertEqual(self.combathandler.ndb.did_action, {self.combatant, self.target})
+        self.combathandler.force_repeat.assert_called_once()
+
+    def test_queue_actions__same_turn(self):
+        """All actions queued together end up in the same turn, even if someone already acted"""
+
+        combatants_at_repeat = []
+        self.combathandler.force_repeat = Mock(
+            side_effect=lambda: combatants_at_repeat.append(dict(self.combathandler.combatants))
         )
-        mock_action.execute.assert_called_once()
+        self.combathandler.ndb.did_action = {self.target}
+        attack, stunt = _attack(self.target), _stunt(self.target, self.combatant, False)
+
+        self.combathandler.queue_actions({self.combatant: attack, self.target: stunt})
+
+        self.combathandler.force_repeat.assert_called_once()
+        self.assertEqual(combatants_at_repeat, [{self.combatant: attack, self.target: stunt}])
+
+    def test_at_repeat__clears_did_action(self):
+        """A new turn resets who has queued an action"""
+
+        self.combathandler.force_repeat = Mock()
+        self.combathandler.queue_action(self.combatant, _HOLD)
+
+        self.combathandler.at_repeat()
+
+        self.assertEqual(self.combathandler.ndb.did_action, set())
 
     def test_execute_full_turn(self):
         """Run a full (passive) turn"""
 
-        hold = {"key": "hold"}
-
-        self.combathandler.queue_action(self.combatant, hold)
-        self.combathandler.queue_action(self.target, hold)
+        self.combathandler.queue_action(self.combatant, _HOLD)
+        self.combathandler.queue_action(self.target, _HOLD)
 
         self.combathandler.execute_next_action = Mock()
 
@@ -429,71 +531,48 @@ class EvAdventureTurnbasedCombatHandlerTest(_CombatTestBase):
     def test_action__action_ticks_turn(self):
         """Test that action execution ticks turns"""
 
-        actiondict = {"key": "hold"}
-        self._run_actions(actiondict, actiondict)
+        self._run_actions(_HOLD, _HOLD)
         self.assertEqual(self.combathandler.turn, 1)
 
         self.combatant.msg.assert_not_called()
 
-    @patch("evennia.contrib.tutorials.evadventure.combat_base.rules.randint")
-    def test_attack__success__kill(self, mock_randint):
-        """Test that the combathandler is deleted once there are no more enemies"""
-        actiondict = {"key": "attack", "target": self.target}
+    @parameterized.expand(
+        [
+            # roll, initial hp, expected hp, combat over?
+            (8, 4, 4, False),  # target has default armor 11, so 8+1 str will miss
+            (11, 20, 9, False),  # 11 + 1 str will hit beat armor 11
+            (11, 4, -7, True),  # killing the only enemy ends the combat
+        ]
+    )
+    def test_attack(self, roll, initial_hp, expected_hp, combat_over):
+        """Test attacking, and that the combathandler is deleted once there are no more enemies"""
+        actiondict = _attack(self.target)
 
-        mock_randint.return_value = 11  # 11 + 1 str will hit beat armor 11
+        self.mock_randint.return_value = roll
+        self.target.hp = initial_hp
         self._run_actions(actiondict)
-        self.assertEqual(self.target.hp, -7)
-        # after this the combat is over
-        self.assertIsNone(self.combathandler.pk)
-
-    @patch("evennia.contrib.tutorials.evadventure.combat_base.rules.randint")
-    def test_stunt_fail(self, mock_randint):
-        action_dict = {
-            "key": "stunt",
-            "recipient": self.combatant,
-            "target": self.target,
-            "advantage": True,
-            "stunt_type": Ability.STR,
-            "defense_type": Ability.DEX,
-        }
-        mock_randint.return_value = 8  # fails 8+1 dex vs DEX 11 defence
-        self._run_actions(action_dict)
-        self.assertEqual(self.combathandler.advantage_matrix[self.combatant], {})
-        self.assertEqual(self.combathandler.disadvantage_matrix[self.combatant], {})
-
-    @patch("evennia.contrib.tutorials.evadventure.combat_base.rules.randint")
-    def test_stunt_advantage__success(self, mock_randint):
-        """Test so the advantage matrix is updated correctly"""
-        action_dict = {
-            "key": "stunt",
-            "recipient": self.combatant,
-            "target": self.target,
-            "advantage": True,
-            "stunt_type": Ability.STR,
-            "defense_type": Ability.DEX,
-        }
-        mock_randint.return_value = 11  # 11+1 dex vs DEX 11 defence is success
-        self._run_actions(action_dict)
-        self.assertEqual(
-            bool(self.combathandler.advantage_matrix[self.combatant][self.target]), True
-        )
-
-    @patch("evennia.contrib.tutorials.evadventure.combat_base.rules.randint")
-    def test_stunt_disadvantage__success(self, mock_randint):
-        """Test so the disadvantage matrix is updated correctly"""
-        action_dict = {
-            "key": "stunt",
-            "recipient": self.target,
-            "target": self.combatant,
-            "advantage": False,
-            "stunt_type": Ability.STR,
-            "defense_type": Ability.DEX,
-        }
-        mock_randint.return_value = 11  # 11+1 dex vs DEX 11 defence is success
+        self.assertEqual(self.target.hp, expected_hp)
+        self.assertEqual(self.combathandler.pk is None, combat_over)
+
+    @parameterized.expand(_STUNT_ROLLS)
+    def test_stunt(self, roll, advantage, is_success):
+        """Test so the advantage/disadvantage matrices are updated correctly"""
+        if advantage:
+            recipient, target = self.combatant, self.target
+        else:
+            recipient, target = self.target, self.combatant
+        action_dict = _stunt(recipient, target, advantage)
+        self.mock_randint.return_value = roll
         self._run_actions(action_dict)
-        self.assertEqual(
-            bool(self.combathandler.disadvantage_matrix[self.target][self.combatant]), True
-        )
+        if is_success:
+            if advantage:
+                matrix = self.combathandler.advantage_matrix
+            else:
+                matrix = self.combathandler.disadvantage_matrix
+            self.assertTrue(matrix[recipient][target])
+        else:
+            self.assertEqual(self.combathandler.advantage_matrix[recipient], {})
+            self.assertEqual(self.combathandler.disadvantage_matrix[recipient], {})
 
     def test_flee__success(self):
         """
@@ -521,7 +600,7 @@ class EvAdventureTurnbasedCombatHandlerTest(_CombatTestBase):
             from_obj=self.combatant,
         )
         # Check that enemies have advantage against you now
-        action = combat_turnbased.CombatAction(self.combathandler, self.target, {"key": "hold"})
+        action = combat_turnbased.CombatAction(self.combathandler, self.target, _HOLD)
         self.assertTrue(action.combathandler.has_advantage(self.target, self.combatant))
 
         # second flee should remove combatant
@@ -534,6 +613,19 @@ class TestEvAdventureTwitchCombatHandler(EvenniaCommandTestMixin, _CombatTestBas
     def setUp(self):
         super().setUp()
 
+        # mock away the tickerhandler used to schedule actions (the ticker-ref returned by
+        # repeat is stored in an Attribute, and unlike a MagicMock, a Mock can be pickled)
+        repeat_patcher = patch(
+            "evennia.contrib.tutorials.evadventure.combat_twitch.repeat", new_callable=Mock
+        )
+        unrepeat_patcher = patch(
+            "evennia.contrib.tutorials.evadventure.combat_twitch.unrepeat", new_callable=Mock
+        )
+        self.mock_repeat = repeat_patcher.start()
+        self.mock_unrepeat = unrepeat_patcher.start()
+        self.addCleanup(repeat_patcher.stop)
+        self.addCleanup(unrepeat_patcher.stop)
+
         # in order to use the EvenniaCommandTestMixin we need these variables defined
         self.char1 = self.combatant
         self.account = None
@@ -561,13 +653,11 @@ class TestEvAdventureTwitchCombatHandler(EvenniaCommandTestMixin, _CombatTestBas
         self.combatant_combathandler.give_disadvantage(self.combatant, self.target)
         self.assertTrue(self.combatant_combathandler.disadvantage_against[self.target])
 
-    @patch("evennia.contrib.tutorials.evadventure.combat_twitch.unrepeat", new=Mock())
-    @patch("evennia.contrib.tutorials.evadventure.combat_twitch.repeat", new=Mock(return_value=999))
     def test_queue_action(self):
         """Test so the queue action cleans up tickerhandler correctly"""
 
-        actiondict = {"key": "hold"}
-        self.combatant_combathandler.queue_action(actiondict)
+        self.mock_repeat.return_value = 999
+        self.combatant_combathandler.queue_action(_HOLD)
 
         self.assertIsNone(self.combatant_combathandler.current_ticker_ref)
 
@@ -575,8 +665,6 @@ class TestEvAdventureTwitchCombatHandler(EvenniaCommandTestMixin, _CombatTestBas
         self.combatant_combathandler.queue_action(actiondict)
         self.assertEqual(self.combatant_combathandler.current_ticker_ref, 999)
 
-    @patch("evennia.contrib.tutorials.evadventure.combat_twitch.unrepeat", new=Mock())
-    @patch("evennia.contrib.tutorials.evadventure.combat_twitch.repeat", new=Mock())
     def test_execute_next_action(self):
         self.combatant_combathandler.action_dict = {
             "key": "hold",
@@ -591,7 +679,6 @@ class TestEvAdventureTwitchCombatHandler(EvenniaCommandTestMixin, _CombatTestBas
             self.combatant_combathandler.fallback_action_dict,
         )
 
-    @patch("evennia.contrib.tutorials.evadventure.combat_twitch.unrepeat", new=Mock())
     def test_check_stop_combat(self):
         """Test combat-stop functionality"""
 
@@ -618,14 +705,10 @@ class TestEvAdventureTwitchCombatHandler(EvenniaCommandTestMixin, _CombatTestBas
             text=("The combat is over.", {}), from_obj=self.combatant
         )
 
-    @patch("evennia.contrib.tutorials.evadventure.combat_twitch.unrepeat", new=Mock())
-    @patch("evennia.contrib.tutorials.evadventure.combat_twitch.repeat", new=Mock())
     def test_hold(self):
         self.call(combat_twitch.CmdHold(), "", "You hold back, doing nothing")
-        self.assertEqual(self.combatant_combathandler.action_dict, {"key": "hold"})
+        self.assertEqual(self.combatant_combathandler.action_dict, _HOLD)
 
-    @patch("evennia.contrib.tutorials.evadventure.combat_twitch.unrepeat", new=Mock())
-    @patch("evennia.contrib.tutorials.evadventure.combat_twitch.repeat", new=Mock())
     def test_attack(self):
         """Test attack action in the twitch combathandler"""
         self.call(combat_twitch.CmdAttack(), self.target.key, "You attack testmonster!")
@@ -634,8 +717,6 @@ class TestEvAdventureTwitchCombatHandler(EvenniaCommandTestMixin, _CombatTestBas
             {"key": "attack", "target": self.target, "dt": 3, "repeat": True},
         )
 
-    @patch("evennia.contrib.tutorials.evadventure.combat_twitch.unrepeat", new=Mock())
-    @patch("evennia.contrib.tutorials.evadventure.combat_twitch.repeat", new=Mock())
     def test_stunt(self):
         boost_result = {
             "key": "stunt",
@@ -688,8 +769,6 @@ class TestEvAdventureTwitchCombatHandler(EvenniaCommandTestMixin, _CombatTestBas
         )
         self.assertEqual(self.combatant_combathandler.action_dict, foil_result)
 
-    @patch("evennia.contrib.tutorials.evadventure.combat_twitch.unrepeat", new=Mock())
-    @patch("evennia.contrib.tutorials.evadventure.combat_twitch.repeat", new=Mock())
     def test_useitem(self):
         item = create.create_object(
             EvAdventureConsumable, key="potion", attributes=[("uses", 2)], location=self.combatant
@@ -711,8 +790,6 @@ class TestEvAdventureTwitchCombatHandler(EvenniaCommandTestMixin, _CombatTestBas
             {"key": "use", "item": item, "target": self.target, "dt": 3},
         )
 
-    @patch("evennia.contrib.tutorials.evadventure.combat_twitch.unrepeat", new=Mock())
-    @patch("evennia.contrib.tutorials.evadventure.combat_twitch.repeat", new=Mock())
     def test_wield(self):
         sword = create.create_object(EvAdventureWeapon, key="sword", location=self.combatant)
         runestone = create.create_object(